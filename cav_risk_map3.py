@@ -5,62 +5,208 @@ import pandas as pd
 import folium
 from streamlit_folium import st_folium
 from folium.plugins import MarkerCluster
-from PIL import Image
-import base64
+from jinja2 import Template
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
 import os
+import threading
+
+from thumbnails import make_thumb
+
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+# === Risk Color Mapping (adjustable logic) ===
+RISK_TIERS = {
+    "red": ("roundabout", "junction", "pedestrian_crossing"),
+    "orange": ("lane_merge", "construction_zone", "curve"),
+    "green": ("mutiple_lanes", "signage", "bus_stop"),
+}
+# Flattened label -> color lookup; unlisted labels default to green
+COLOR_MAP = {label: color
+             for color, labels in RISK_TIERS.items() for label in labels}
+
+
+class RiskMarkerCluster(MarkerCluster):
+    """Marker cluster rendered from a single injected JSON payload.
+
+    ``points`` rows are ``[lat, lng, color, feature, confidence, image_idx]``
+    and ``images`` holds each distinct popup image URI once, so thumbnails
+    shared by several detections are not repeated in the page. Markers are
+    built in one JS loop and popup HTML is only assembled on click.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function () {
+                var images = {{ this.images|tojson }};
+                var points = {{ this.points|tojson }};
+                var cluster = L.markerClusterGroup({{ this.options|tojson }});
+                points.forEach(function (p) {
+                    L.marker([p[0], p[1]], {
+                        icon: L.AwesomeMarkers.icon({
+                            icon: 'info-sign', markerColor: p[2],
+                            prefix: 'glyphicon'})
+                    }).bindPopup(function () {
+                        return '<b>Feature:</b> ' + p[3] + '<br>' +
+                            '<b>Confidence:</b> ' + p[4].toFixed(2) + '<br>' +
+                            "<img src='" + images[p[5]] + "' width='300'>";
+                    }, {maxWidth: 350}).addTo(cluster);
+                });
+                cluster.addTo({{ this._parent.get_name() }});
+                return cluster;
+            })();
+        {% endmacro %}""")
+
+    def __init__(self, points, images, **kwargs):
+        super().__init__(**kwargs)
+        self._name = "RiskMarkerCluster"
+        self.points = points
+        self.images = images
+
 
 # === Load metadata ===
 CSV_PATH = "D:\Google Drive\My Drive\CAV\inference_results\streamlit_metadata.csv"
-df = pd.read_csv(CSV_PATH)
 
-# === Sidebar Filters ===
-st.sidebar.header("🔍 Filter Options")
-features = sorted(df["feature"].unique())
-selected_features = st.sidebar.multiselect(
-    "Select Feature(s)", features, default=features)
-confidence_threshold = st.sidebar.slider(
-    "Minimum Confidence", 0.0, 1.0, 0.5, 0.01)
 
-# === Filter Data ===
-df_filtered = df[(df["feature"].isin(selected_features)) &
-                 (df["confidence"] >= confidence_threshold)]
+@st.cache_data
+def load_metadata(path, mtime):
+    """Read the inference metadata CSV (cache is invalidated by mtime).
 
-# === Create Folium Map ===
-mid_lat = df_filtered["lat"].mean()
-mid_lng = df_filtered["lng"].mean()
-m = folium.Map(location=[mid_lat, mid_lng], zoom_start=9, control_scale=True)
-marker_cluster = MarkerCluster().add_to(m)
+    Returns the frame plus the sorted feature labels for the filter widget,
+    taken from the categorical's categories rather than a column scan.
+    """
+    df = pd.read_csv(
+        path,
+        usecols=["feature", "confidence", "lat", "lng", "image_path"],
+        dtype={"feature": "category", "confidence": "float32",
+               "lat": "float32", "lng": "float32"},
+        engine=CSV_ENGINE,
+    )
+    # Map once per category; labels missing from COLOR_MAP default to green
+    df["color"] = df["feature"].map(
+        {label: COLOR_MAP.get(label, "green")
+         for label in df["feature"].cat.categories})
+    return df, tuple(sorted(df["feature"].cat.categories))
+
+
+# Below this many images, overlapping reads/decodes in threads (PIL releases
+# the GIL while decoding) beats paying process start-up and pickling costs
+PROCESS_POOL_MIN_IMAGES = 500
+# Thumbnails kept across reruns and sessions, least recently used dropped first
+THUMB_CACHE_MAX = 5000
+
+
+async def _thumbs_in_threads(paths):
+    return await asyncio.gather(
+        *[asyncio.to_thread(make_thumb, path) for path in paths])
+
+
+def _build_thumbs(paths):
+    if len(paths) < PROCESS_POOL_MIN_IMAGES:
+        return asyncio.run(_thumbs_in_threads(paths))
+    with ProcessPoolExecutor() as ex:
+        return list(ex.map(make_thumb, paths, chunksize=16))
 
-# === Risk Color Mapping (adjustable logic) ===
 
+@st.cache_resource
+def thumb_cache():
+    """Shared LRU of thumbnail URIs keyed by (path, mtime), plus its lock."""
+    return OrderedDict(), threading.Lock()
 
-def get_risk_color(label):
-    critical = ["roundabout", "junction", "pedestrian_crossing"]
-    medium = ["lane_merge", "construction_zone", "curve"]
-    low = ["mutiple_lanes", "signage", "bus_stop"]
-    if label in critical:
-        return "red"
-    elif label in medium:
-        return "orange"
-    else:
-        return "green"
-
-
-# === Add Markers ===
-for _, row in df_filtered.iterrows():
-    popup_html = f"""
-    <b>Feature:</b> {row['feature']}<br>
-    <b>Confidence:</b> {row['confidence']:.2f}<br>
-    <img src='file://{row['image_path']}' width='300'>
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:  # missing file; make_thumb falls back to file://
+        return None
+
+
+def thumbnail_uris(paths):
+    """Map each image path to its thumbnail data URI.
+
+    Thumbnails are cached per (path, mtime), so a new filter selection only
+    builds the images it has not seen (or that were edited), concurrently.
+    """
+    cache, lock = thumb_cache()
+    keys = [(path, _mtime(path)) for path in paths]
+
+    uris, misses = {}, []
+    with lock:
+        for key in keys:
+            if key in cache:
+                cache.move_to_end(key)
+                uris[key[0]] = cache[key]
+            else:
+                misses.append(key)
+
+    if misses:
+        built = _build_thumbs([path for path, _ in misses])
+        with lock:
+            for key, uri in zip(misses, built):
+                cache[key] = uri
+                uris[key[0]] = uri
+            while len(cache) > THUMB_CACHE_MAX:
+                cache.popitem(last=False)
+
+    return {path: uris[path] for path in paths}
+
+
+@st.cache_resource(max_entries=16)
+def build_map(features_tuple, thr, mtime):
+    """Build the marker map for one filter selection.
+
+    Cached as a resource (not data) because the Folium Map is mutable and
+    should be shared rather than pickled and copied on every hit.
     """
-    folium.Marker(
-        location=[row["lat"], row["lng"]],
-        icon=folium.Icon(color=get_risk_color(
-            row["feature"]), icon="info-sign"),
-        popup=folium.Popup(popup_html, max_width=350)
-    ).add_to(marker_cluster)
+    df, _ = load_metadata(CSV_PATH, mtime)
+
+    # === Filter Data ===
+    df_filtered = df.loc[df["feature"].isin(features_tuple) &
+                         (df["confidence"].values >= thr)]
+
+    # === Create Folium Map ===
+    mid_lat, mid_lng = df_filtered[["lat", "lng"]].to_numpy().mean(axis=0)
+    m = folium.Map(location=[float(mid_lat), float(mid_lng)],
+                   zoom_start=9, control_scale=True)
+
+    # === Add Markers ===
+    paths = tuple(sorted(df_filtered["image_path"].unique()))
+    image_idx = {path: i for i, path in enumerate(paths)}
+    points = list(zip(
+        df_filtered["lat"].tolist(),
+        df_filtered["lng"].tolist(),
+        df_filtered["color"].astype(str).tolist(),
+        df_filtered["feature"].astype(str).tolist(),
+        df_filtered["confidence"].tolist(),
+        df_filtered["image_path"].map(image_idx).tolist(),
+    ))
+    uris = thumbnail_uris(paths)
+    images = [uris[path] for path in paths]
+    RiskMarkerCluster(points, images).add_to(m)
+    return m
+
+
+csv_mtime = os.path.getmtime(CSV_PATH)
+_, features = load_metadata(CSV_PATH, csv_mtime)
+
+# === Sidebar Filters ===
+st.sidebar.header("🔍 Filter Options")
+selected_features = st.sidebar.multiselect(
+    "Select Feature(s)", features, default=list(features))
+confidence_threshold = st.sidebar.slider(
+    "Minimum Confidence", 0.0, 1.0, 0.5, 0.01)
+
+m = build_map(tuple(selected_features), confidence_threshold, csv_mtime)
 
 # === Display Map ===
 st.title("Route10 - Route Risk Detection Viewer")
 st.markdown("""This map shows detected road features along the Dover to Milton Keynes route, with classification results overlayed as colored markers. Click on a marker for details""")
-st_data = st_folium(m, width=3000, height=800)
+# Nothing reads the map's click state, so return no objects (map
+# interaction then never triggers a rerun) and keep a stable key so the
+# component is updated in place rather than re-mounted.
+st_folium(m, width=3000, height=800, key="risk_map", returned_objects=[])
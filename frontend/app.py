@@ -4,12 +4,14 @@ Enterprise Demo Interface
 """
 
 import streamlit as st
+import atexit
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
-import json
 import os
 
 # Get the directory where this script is located
@@ -26,239 +28,331 @@ st.set_page_config(
 # Configuration
 API_BASE_URL = st.secrets.get("API_URL")
 
-# Custom CSS for professional styling
-st.markdown("""
-<style>
-        :root {
-        --route10-primary: #060608;
-        --route10-secondary: #ffffff;
-        --route10-accent: #06fd01;
-        --route10-dark: #262624;
-        --route10-light: #f8f9fa;
-    }
-    
-    /* Main app background */
-    .stApp {
-        background: #f5f5f5;
-    }
-    
-    /* Main content area */
-    .main .block-container {
-        background: linear-gradient(180deg, #ffffff 0%, #f0fff0 100%);
-        padding: 2rem;
-        border-radius: 10px;
-    }
-    
-    /* Sidebar */
-    [data-testid="stSidebar"] {
-        background: var(--route10-primary);
-    }
-    
-    /* Sidebar text colors */
-    [data-testid="stSidebar"] * {
-        color: var(--route10-secondary) !important;
-    }
-    
-    /* Sidebar headers */
-    [data-testid="stSidebar"] h3 {
-        color: var(--route10-accent) !important;
-        font-weight: 600;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        font-size: 0.9rem;
-        border-bottom: 1px solid var(--route10-accent);
-        padding-bottom: 0.5rem;
-        margin-top: 1rem;
-    }
-            
-    /* Sidebar divider lines - more spacing */
-    [data-testid="stSidebar"] hr {
-        border-color: var(--route10-accent) !important;
-        opacity: 0.3;
-        margin-top: 1.5rem;
-        margin-bottom: 1.5rem;
-    }
+# Preset locations for demo
+LOCATION_PRESETS = {
+    "Port of Dover": (51.1279, 1.3134),
+    "Magna Park MK": (52.0406, -0.7594),
+    "M25 Junction 15": (51.6800, -0.5500),
+    "Birmingham": (52.4862, -1.8904),
+}
+CUSTOM_LOCATION_DEFAULT = (51.5074, -0.1278)
+# Selectbox label -> coordinates ("Custom" has none)
+LOCATION_PRESET_OPTIONS = {
+    "Custom": None,
+    **{f"{name} ({lat:.4f}, {lon:.4f})": (lat, lon)
+       for name, (lat, lon) in LOCATION_PRESETS.items()},
+}
+
+# Preset routes
+ROUTE_PRESETS = {
+    "Custom": None,
+    "🚢 Dover to Milton Keynes (189km)": {
+        "start": (51.1279, 1.3134),
+        "end": (52.0406, -0.7594),
+    },
+    "📦 Felixstowe to Birmingham (165km)": {
+        "start": (51.9614, 1.3511),
+        "end": (52.4862, -1.8904),
+    },
+    "🏭 Southampton to Manchester (265km)": {
+        "start": (50.9097, -1.4044),
+        "end": (53.4808, -2.2426),
+    },
+    "🏙️ London to Birmingham (193km)": {
+        "start": (51.5074, -0.1278),
+        "end": (52.4862, -1.8904),
+    },
+    "🏙️ Manchester to Leeds (64km)": {
+        "start": (53.4808, -2.2426),
+        "end": (53.8008, -1.5491),
+    },
+    "🏙️ Edinburgh to Glasgow (75km)": {
+        "start": (55.9533, -3.1883),
+        "end": (55.8642, -4.2518),
+    },
+    "🏙️ Bristol to Cardiff (72km)": {
+        "start": (51.4545, -2.5879),
+        "end": (51.4816, -3.1791),
+    },
+    "🚕 Central London Loop (15km)": {
+        "start": (51.5074, -0.1278),
+        "end": (51.5155, -0.0922),
+    },
+    "🏙️ Manchester City Centre (10km)": {
+        "start": (53.4808, -2.2426),
+        "end": (53.4723, -2.2360),
+    },
+    "🛣️ M25 West Section (50km)": {
+        "start": (51.4700, -0.4543),
+        "end": (51.6800, -0.5500),
+    },
+    "🌄 Peak District Rural (45km)": {
+        "start": (53.3498, -1.5912),
+        "end": (53.2058, -1.8842),
+    }
+}
+ROUTE_PRESET_NAMES = list(ROUTE_PRESETS)
+
+# Only allow assessment for available routes (the mock dataset's coverage)
+SUPPORTED_ROUTES = [
+    "🚢 Dover to Milton Keynes (189km)",
+    "🏙️ London to Birmingham (193km)",
+    "🏙️ Manchester to Leeds (64km)"
+]
+
+
+@st.cache_resource
+def api_session():
+    """Shared HTTP session so API calls reuse pooled keep-alive connections.
+
+    Held for the lifetime of the server process and closed at exit.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10, pool_maxsize=20,
+        # Retry dropped connections only. read=False re-raises read errors
+        # as-is, so a slow response surfaces as ReadTimeout after one timeout
+        max_retries=Retry(total=2, read=False, backoff_factor=0.2))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    atexit.register(session.close)
+    return session
+
+
+@st.cache_resource
+def api_executor():
+    """Worker threads for API calls that can overlap with page rendering."""
+    executor = ThreadPoolExecutor(max_workers=4)
+    atexit.register(executor.shutdown, wait=False)
+    return executor
+
+
+def submit(fn, *args):
+    """Run fn(*args) on the API executor under this session's script context."""
+    ctx = get_script_run_ctx()
+
+    def run():
+        add_script_run_ctx(ctx=ctx)
+        return fn(*args)
+
+    return api_executor().submit(run)
+
+
+def get_json(path, timeout, **params):
+    """GET an API path on the shared session; raises on non-2xx status."""
+    response = api_session().get(
+        f"{API_BASE_URL}{path}", params=params or None, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_stats():
+    """Fetch national statistics, reused across reruns for five minutes."""
+    return get_json("/api/v1/stats", timeout=10)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_location(lat, lon):
+    """Fetch the readiness assessment for a coordinate (successes only)."""
+    return get_json("/api/v1/location/readiness", timeout=15,
+                    lat=lat, lon=lon)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_route(start_lat, start_lon, end_lat, end_lon):
+    """Fetch the route assessment between two points (successes only)."""
+    return get_json("/api/v1/route/assess", timeout=30,
+                    start_lat=start_lat, start_lon=start_lon,
+                    end_lat=end_lat, end_lon=end_lon)
+
+
+def coord_key(*coords):
+    """Round coordinates to 6 dp (~0.1 m) so equal presets share cache keys."""
+    return tuple(round(c, 6) for c in coords)
+
+
+# Shared chart styling
+LAYOUT_TRANSPARENT = {
+    "showlegend": False,
+    "font": {"family": "Arial, sans-serif", "size": 12},
+    "plot_bgcolor": "rgba(0,0,0,0)",
+    "paper_bgcolor": "rgba(0,0,0,0)",
+}
+# Red → Yellow → Green
+QUALITY_COLOR_SCALE = ['#ef4444', '#f59e0b', '#00a86b']
+RISK_COLOR_MAP = {'COMPLIANT': 'green',
+                  'MODERATE': 'yellow', 'CRITICAL': 'red'}
+RISK_EMOJI = {'COMPLIANT': '🟢', 'MODERATE': '🟡', 'CRITICAL': '🔴'}
+
+# Cached figure builders: inputs are plain tuples/floats so cache keys hash
+# cheaply. A repeat render skips the plotly.express assembly only; the
+# stored JSON is still rebuilt into a figure, which st.plotly_chart then
+# validates and serialises itself.
+
+
+@st.cache_data(show_spinner=False)
+def quality_bar_json(lane_markings, signage_visibility, surface_condition):
+    import plotly.express as px
+
+    quality_data = pd.DataFrame({
+        'Metric': ['Lane Markings', 'Signage Visibility', 'Surface Condition'],
+        'Quality': [
+            lane_markings * 100,
+            signage_visibility * 100,
+            surface_condition * 100
+        ]
+    })
+
+    fig = px.bar(
+        quality_data,
+        x='Quality',
+        y='Metric',
+        orientation='h',
+        title='Infrastructure Quality Metrics',
+        color='Quality',
+        color_continuous_scale=QUALITY_COLOR_SCALE,
+        range_color=[0, 100]
+    )
+    fig.update_layout(**LAYOUT_TRANSPARENT)
+    return fig.to_json()
 
-    /* Hide the last HR (after ABOUT) */
-    [data-testid="stSidebar"] hr:last-of-type {
-        display: none;
-    }
 
-    /* Style the info box in sidebar */
-    [data-testid="stSidebar"] .stAlert,
-    [data-testid="stSidebar"] [data-baseweb="notification"] {
-        background-color: #262624 !important;
-        border: none !important;
-        border-left: none !important;
-        border-radius: 8px;
-        padding: 1rem;
-    }
+@st.cache_data(show_spinner=False)
+def score_histogram_json(scores):
+    import plotly.express as px
 
-    /* Remove green background from info text */
-    [data-testid="stSidebar"] .stInfo {
-        background-color: #262624 !important;
-        border: none !important;
-        color: var(--route10-secondary) !important;
-    }
+    fig = px.histogram(
+        x=list(scores),
+        nbins=20,
+        title='Readiness Score Distribution',
+        color_discrete_sequence=['#1f77b4']
+    )
+    fig.update_layout(
+        xaxis_title="Readiness Score (%)",
+        yaxis_title="Number of Segments"
+    )
+    return fig.to_json()
 
-    /* Ensure text in info box is white */
-    [data-testid="stSidebar"] .stInfo * {
-        color: var(--route10-secondary) !important;
-    }
-    
-    /* Sidebar markdown text */
-    [data-testid="stSidebar"] .stMarkdown {
-        color: var(--route10-secondary) !important;
-    }
-    
-    /* Sidebar metrics */
-    [data-testid="stSidebar"] [data-testid="stMetricValue"] {
-        color: var(--route10-accent) !important;
-        font-weight: 700;
-        font-size: 1.5rem;
-    }
-    
-    [data-testid="stSidebar"] [data-testid="stMetricLabel"] {
-        color: var(--route10-secondary) !important;
-    }
-    
-    /* Sidebar radio buttons */
-    [data-testid="stSidebar"] label {
-        color: var(--route10-secondary) !important;
-    }
-    
-    /* Sidebar divider lines */
-    [data-testid="stSidebar"] hr {
-        border-color: var(--route10-accent) !important;
-        opacity: 0.3;
-    }
-    
-    /* Main content text */
-    .main * {
-        color: var(--route10-dark);
-    }
-    
-    /* Main content headers */
-    .main h1, .main h2, .main h3 {
-        color: var(--route10-primary);
-    }
 
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        background: linear-gradient(245deg, var(--route10-primary) 0%, var(--route10-accent) 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        margin-bottom: 0.5rem;
-    }
+@st.cache_data(show_spinner=False)
+def risk_pie_json(risk_counts):
+    import plotly.express as px
 
-    .sub-header {
-        font-size: 1.2rem;
-        color: #666;
-        margin-bottom: 2rem;
-        font-weight: 500;
-    }
-    
-    /* Input fields */
-    .stTextInput input, .stNumberInput input {
-        background-color: white;
-        color: var(--route10-dark);
-        border: 1px solid #ddd;
-        border-radius: 5px;
-    }
-    
-    .stTextInput input:focus, .stNumberInput input:focus {
-        border-color: var(--route10-accent);
-        box-shadow: 0 0 0 2px rgba(6, 253, 1, 0.1);
-    }
-    
-    /* Select boxes */
-    .stSelectbox select {
-        background-color: white;
-        color: var(--route10-dark);
-        border: 1px solid #ddd;
-        border-radius: 5px;
-    }
+    levels, counts = zip(*risk_counts)
+    fig = px.pie(
+        values=counts,
+        names=levels,
+        title='Risk Level Distribution',
+        color=levels,
+        color_discrete_map=RISK_COLOR_MAP
+    )
+    return fig.to_json()
 
-    /* Buttons - Route10 style */
-    .stButton>button {
-        background: linear-gradient(135deg, var(--route10-secondary) 0%, var(--route10-primary) 100%);
-        color: var(--route10-secondary);
-        border: 1px solid var(--route10-accent);
-        border-radius: 10px;
-        padding: 0.75rem 2rem;
-        font-weight: 600;
-        transition: all 0.3s;
-    }
 
-    .stButton>button:hover {
-        background: var(--route10-accent);
-        color: var(--route10-primary);
-        transform: translateY(-2px);
-        box-shadow: 0 6px 12px rgba(6, 253, 1, 0.4);
-    }
+@st.cache_data(show_spinner=False)
+def risk_bar_json(risk_distribution):
+    import plotly.express as px
 
-    /* Risk badges - Route10 style */
-    .risk-badge-compliant {
-        background: var(--route10-accent);
-        color: var(--route10-primary);
-        padding: 0.5rem 1rem;
-        border-radius: 20px;
-        font-weight: 600;
-        display: inline-block;
-        box-shadow: 0 2px 4px rgba(6, 253, 1, 0.3);
-    }
+    risk_data = pd.DataFrame(risk_distribution, columns=['Risk Level', 'Count'])
 
-    .risk-badge-moderate {
-        background: linear-gradient(135deg, #f59e0b 0%, #fbbf24 100%);
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 20px;
-        font-weight: 600;
-        display: inline-block;
-        box-shadow: 0 2px 4px rgba(245, 158, 11, 0.3);
-    }
+    fig = px.bar(
+        risk_data,
+        x='Risk Level',
+        y='Count',
+        title='Road Segments by Risk Category',
+        color='Risk Level',
+        color_discrete_map=RISK_COLOR_MAP
+    )
+    return fig.to_json()
+
+
+RISK_LEVELS = ['COMPLIANT', 'MODERATE', 'CRITICAL']
+
+# Route map fill colours (RGB) matching the risk badge palette
+RISK_RGB = {'COMPLIANT': (0, 168, 107),
+            'MODERATE': (245, 158, 11), 'CRITICAL': (239, 68, 68)}
+# Same colours as an array in RISK_LEVELS (category code) order
+RISK_PALETTE = np.array([RISK_RGB[level] for level in RISK_LEVELS],
+                        dtype=np.uint8)
+
+
+@st.cache_resource(max_entries=16, ttl=3600, show_spinner=False)
+def route_deck(route_key, _segments_df):
+    """Scatterplot deck of route segments coloured by risk, one per route.
+
+    Cached as a shared resource keyed by the rounded route coordinates (the
+    segments frame is not hashed), so re-rendering a route skips rebuilding
+    the layer data. The ttl matches fetch_route, whose result it draws.
+    """
+    import pydeck as pdk
+
+    # Index the palette by category codes: one vectorised table lookup
+    # instead of a per-row dict lookup on object strings
+    rgb = RISK_PALETTE[_segments_df['risk_level'].cat.codes.to_numpy()]
+    data = pd.DataFrame({
+        'lat': _segments_df['lat'].to_numpy(),
+        'lon': _segments_df['lon'].to_numpy(),
+        'r': rgb[:, 0],
+        'g': rgb[:, 1],
+        'b': rgb[:, 2],
+    })
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=data,
+        get_position='[lon, lat]',
+        get_fill_color='[r, g, b]',
+        get_radius=300,
+        radius_min_pixels=2,
+    )
+    view = pdk.ViewState(
+        latitude=float(data['lat'].mean()),
+        longitude=float(data['lon'].mean()),
+        zoom=7,
+    )
+    return pdk.Deck(layers=[layer], initial_view_state=view,
+                    map_provider="carto", map_style="light")
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def location_deck(lat, lon):
+    """Single-point locator map, cached per coordinate (rounded by caller)."""
+    import pydeck as pdk
+
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=pd.DataFrame({'lat': [lat], 'lon': [lon]}),
+        get_position='[lon, lat]',
+        get_fill_color=list(RISK_RGB['COMPLIANT']),
+        get_radius=200,
+        radius_min_pixels=6,
+    )
+    view = pdk.ViewState(latitude=lat, longitude=lon, zoom=10, height=300)
+    return pdk.Deck(layers=[layer], initial_view_state=view,
+                    map_provider="carto", map_style="light")
 
-    .risk-badge-critical {
-        background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 20px;
-        font-weight: 600;
-        display: inline-block;
-        box-shadow: 0 2px 4px rgba(239, 68, 68, 0.3);
-    }
 
-    /* Info boxes */
-    .stAlert {
-        border-radius: 10px;
-        border-left-width: 4px;
-    }
-    
-    /* Success messages - green accent */
-    [data-baseweb="notification"] {
-        background-color: rgba(6, 253, 1, 0.1);
-        border-left: 4px solid var(--route10-accent);
-    }
-            
-    /* Remove top padding from columns */
-    [data-testid="column"] {
-        padding-top: 0 !important;
-    }
+def show_figure(fig_json):
+    """Render a cached figure JSON as a full-width plotly chart.
 
-    /* Align map container */
-    .main .block-container > div:first-child {
-        padding-top: 0.5rem;
-    }
+    pio.from_json rebuilds (and validates) the figure on every call, so
+    only the builders' plotly.express work is saved by the cache.
+    """
+    import plotly.io as pio
 
-    /* Remove spacing above main header */
-    .main-header {
-        margin-top: 0 !important;
-        padding-top: 0 !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+    st.plotly_chart(pio.from_json(fig_json), use_container_width=True)
+
+
+# Custom CSS for professional styling
+@st.cache_resource
+def app_css():
+    """Stylesheet, read from disk once per server process."""
+    with open(os.path.join(SCRIPT_DIR, "assets", "app.css"), encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+
+# Injected on every run: Streamlit drops elements a rerun doesn't re-emit
+st.markdown(app_css(), unsafe_allow_html=True)
 
 # Sidebar
 with st.sidebar:
@@ -271,21 +365,16 @@ with st.sidebar:
         ["Location Assessment", "Route Assessment", "UK Overview"],
         label_visibility="collapsed"
     )
+    # One cached stats request serves the sidebar and, in UK Overview, the
+    # page; started now so it overlaps with rendering the selected page
+    stats_future = submit(fetch_stats)
 
     st.markdown("---")
     st.markdown("### 📊 Quick Stats")
 
-    try:
-        stats_response = requests.get(
-            f"{API_BASE_URL}/api/v1/stats", timeout=10)
-        if stats_response.status_code == 200:
-            stats = stats_response.json()
-            st.metric("Total Segments",
-                      f"{stats['total_segments_assessed']:,}")
-            st.metric("Avg Readiness", f"{stats['average_readiness_score']}%")
-            st.metric("Coverage", f"{stats['coverage_km']} km")
-    except Exception as e:
-        st.warning("Unable to load stats")
+    # Filled in after the main content, so the stats request overlaps with
+    # rendering the selected page instead of blocking it
+    stats_slot = st.container()
 
     st.markdown("---")
     st.markdown("### ℹ️ About")
@@ -297,9 +386,13 @@ with st.sidebar:
     Supporting the UK's 2026 AV rollout targets.
     """)
 
-# Main content area
-if mode == "Location Assessment":
+# Main content pages. Each is a fragment, so widgets inside a page only
+# rerun that page instead of the whole script.
+
 
+@st.fragment
+def render_location():
+    """Single Location Assessment page."""
     # Header row with map
     title_col, map_col = st.columns([1, 1])
 
@@ -317,11 +410,9 @@ if mode == "Location Assessment":
             st.session_state.latitude = 51.1279
             st.session_state.longitude = 1.3134
 
-        map_data = pd.DataFrame({
-            'lat': [st.session_state.get('latitude', 51.1279)],
-            'lon': [st.session_state.get('longitude', 1.3134)]
-        })
-        st.map(map_data, zoom=10, height=300)
+        st.pydeck_chart(location_deck(
+            round(st.session_state.latitude, 4),
+            round(st.session_state.longitude, 4)))
 
     st.markdown("---")
 
@@ -332,21 +423,11 @@ if mode == "Location Assessment":
         # Preset locations for demo
         preset = st.selectbox(
             "Choose a preset location:",
-            [
-                "Custom",
-                "Port of Dover (51.1279, 1.3134)",
-                "Magna Park MK (52.0406, -0.7594)",
-                "M25 Junction 15 (51.6800, -0.5500)",
-                "Birmingham (52.4862, -1.8904)"
-            ]
+            list(LOCATION_PRESET_OPTIONS)
         )
 
-        if preset != "Custom":
-            lat_default = float(preset.split("(")[1].split(",")[0])
-            lon_default = float(preset.split(",")[1].split(")")[0].strip())
-        else:
-            lat_default = 51.5074
-            lon_default = -0.1278
+        lat_default, lon_default = (LOCATION_PRESET_OPTIONS[preset]
+                                    or CUSTOM_LOCATION_DEFAULT)
 
         latitude = st.number_input(
             "Latitude", value=lat_default, format="%.6f")
@@ -371,124 +452,104 @@ if mode == "Location Assessment":
         """)
 
         st.markdown("#### 📍 Current Selection")
-        st.code(f"Latitude:  {latitude:.6f}\nLongitude: {longitude:.6f}")
+        st.text(f"Latitude:  {latitude:.6f}\nLongitude: {longitude:.6f}")
+
+    location_key = coord_key(latitude, longitude)
 
     if assess_button:
         with st.spinner("🔍 Analyzing road segment... Checking infrastructure quality, detecting features..."):
             try:
-                response = requests.get(
-                    f"{API_BASE_URL}/api/v1/location/readiness",
-                    params={"lat": latitude, "lon": longitude},
-                    timeout=15
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-
-                    # Results header
-                    st.markdown("---")
-                    st.markdown("## 📊 Assessment Results")
-
-                    # Key metrics
-                    col1, col2, col3, col4 = st.columns(4)
-
-                    with col1:
-                        st.metric(
-                            "Readiness Score",
-                            f"{data['readiness_score']}%",
-                            delta=f"{data['readiness_score'] - 70:.1f}" if data['readiness_score'] > 70 else None
-                        )
-
-                    with col2:
-                        risk_colors = {'COMPLIANT': '🟢',
-                                       'MODERATE': '🟡', 'CRITICAL': '🔴'}
-                        st.metric(
-                            "Risk Level",
-                            f"{risk_colors.get(data['risk_level'], '')} {data['risk_level']}"
-                        )
-
-                    with col3:
-                        st.metric(
-                            "Lane Marking Quality",
-                            f"{data['infrastructure_quality']['lane_markings'] * 100:.0f}%"
-                        )
-
-                    with col4:
-                        st.metric(
-                            "Features Detected",
-                            len(data['detected_features'])
-                        )
-
-                    # Detailed breakdown
-                    st.markdown("### 🔎 Infrastructure Analysis")
-
-                    col1, col2 = st.columns([2, 1])
-
-                    with col1:
-                        # Infrastructure quality chart
-                        quality_data = pd.DataFrame({
-                            'Metric': ['Lane Markings', 'Signage Visibility', 'Surface Condition'],
-                            'Quality': [
-                                data['infrastructure_quality']['lane_markings'] * 100,
-                                data['infrastructure_quality']['signage_visibility'] * 100,
-                                data['infrastructure_quality']['surface_condition'] * 100
-                            ]
-                        })
-
-                        fig = px.bar(
-                            quality_data,
-                            x='Quality',
-                            y='Metric',
-                            orientation='h',
-                            title='Infrastructure Quality Metrics',
-                            color='Quality',
-                            # Red → Yellow → Green
-                            color_continuous_scale=[
-                                '#ef4444', '#f59e0b', '#00a86b'],
-                            range_color=[0, 100]
-                        )
-                        fig.update_layout(
-                            showlegend=False,
-                            font=dict(family="Arial, sans-serif", size=12),
-                            plot_bgcolor='rgba(0,0,0,0)',
-                            paper_bgcolor='rgba(0,0,0,0)'
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-
-                    with col2:
-                        st.markdown("#### Detected Features")
-                        if data['detected_features']:
-                            for feature in data['detected_features']:
-                                st.markdown(f"- `{feature}`")
-                        else:
-                            st.info("No special features detected")
-
-                        st.markdown("#### Weather Impact")
-                        st.progress(
-                            data['weather_impact'], text=f"{data['weather_impact']*100:.0f}% impact")
-
-                    # Recommendations (would come from API in production)
-                    st.markdown("### 💡 Recommendations")
-                    if data['readiness_score'] >= 75:
-                        st.success(
-                            "✅ This location meets minimum readiness criteria for AV deployment")
-                    elif data['readiness_score'] >= 50:
-                        st.warning(
-                            "⚠️ Moderate risk - consider infrastructure improvements or operational restrictions")
-                    else:
-                        st.error(
-                            "🚫 Critical issues detected - not recommended for AV deployment without remediation")
-
-                else:
-                    st.error(
-                        f"Error: {response.status_code} - {response.text}")
-
+                # Kept in session state so fragment reruns (e.g. typing in
+                # an unrelated field) re-render without another API call
+                st.session_state.location_results = {
+                    'key': location_key,
+                    'data': fetch_location(*location_key)
+                }
+            except requests.exceptions.HTTPError as e:
+                st.error(
+                    f"Error: {e.response.status_code} - {e.response.text}")
             except requests.exceptions.Timeout:
                 st.error("⏱️ Request timed out. Please try again.")
             except Exception as e:
                 st.error(f"❌ Error: {str(e)}")
 
-elif mode == "Route Assessment":
+    results = st.session_state.get('location_results')
+    if results and results['key'] == location_key:
+        data = results['data']
+
+        # Results header
+        st.markdown("---")
+        st.markdown("## 📊 Assessment Results")
+
+        # Key metrics
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric(
+                "Readiness Score",
+                f"{data['readiness_score']}%",
+                delta=f"{data['readiness_score'] - 70:.1f}" if data['readiness_score'] > 70 else None
+            )
+
+        with col2:
+            st.metric(
+                "Risk Level",
+                f"{RISK_EMOJI.get(data['risk_level'], '')} {data['risk_level']}"
+            )
+
+        with col3:
+            st.metric(
+                "Lane Marking Quality",
+                f"{data['infrastructure_quality']['lane_markings'] * 100:.0f}%"
+            )
+
+        with col4:
+            st.metric(
+                "Features Detected",
+                len(data['detected_features'])
+            )
+
+        # Detailed breakdown
+        st.markdown("### 🔎 Infrastructure Analysis")
+
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            # Infrastructure quality chart
+            quality = data['infrastructure_quality']
+            show_figure(quality_bar_json(
+                quality['lane_markings'],
+                quality['signage_visibility'],
+                quality['surface_condition']))
+
+        with col2:
+            st.markdown("#### Detected Features")
+            if data['detected_features']:
+                st.markdown("\n".join(
+                    f"- `{feature}`" for feature in data['detected_features']))
+            else:
+                st.info("No special features detected")
+
+            st.markdown("#### Weather Impact")
+            st.progress(
+                data['weather_impact'], text=f"{data['weather_impact']*100:.0f}% impact")
+
+        # Recommendations (would come from API in production)
+        st.markdown("### 💡 Recommendations")
+        if data['readiness_score'] >= 75:
+            st.success(
+                "✅ This location meets minimum readiness criteria for AV deployment")
+        elif data['readiness_score'] >= 50:
+            st.warning(
+                "⚠️ Moderate risk - consider infrastructure improvements or operational restrictions")
+        else:
+            st.error(
+                "🚫 Critical issues detected - not recommended for AV deployment without remediation")
+
+
+@st.fragment
+def render_route():
+    """Route Assessment page."""
     # Header
     st.markdown('<div class="main-header">R10 - AV Route Assessment</div>',
                 unsafe_allow_html=True)
@@ -499,55 +560,6 @@ elif mode == "Route Assessment":
     st.markdown(
         "Analyze CAV readiness along a complete route between two points.")
 
-    # Preset routes
-    preset_routes = {
-        "Custom": None,
-        "🚢 Dover to Milton Keynes (189km)": {
-            "start": (51.1279, 1.3134),
-            "end": (52.0406, -0.7594),
-        },
-        "📦 Felixstowe to Birmingham (165km)": {
-            "start": (51.9614, 1.3511),
-            "end": (52.4862, -1.8904),
-        },
-        "🏭 Southampton to Manchester (265km)": {
-            "start": (50.9097, -1.4044),
-            "end": (53.4808, -2.2426),
-        },
-        "🏙️ London to Birmingham (193km)": {
-            "start": (51.5074, -0.1278),
-            "end": (52.4862, -1.8904),
-        },
-        "🏙️ Manchester to Leeds (64km)": {
-            "start": (53.4808, -2.2426),
-            "end": (53.8008, -1.5491),
-        },
-        "🏙️ Edinburgh to Glasgow (75km)": {
-            "start": (55.9533, -3.1883),
-            "end": (55.8642, -4.2518),
-        },
-        "🏙️ Bristol to Cardiff (72km)": {
-            "start": (51.4545, -2.5879),
-            "end": (51.4816, -3.1791),
-        },
-        "🚕 Central London Loop (15km)": {
-            "start": (51.5074, -0.1278),
-            "end": (51.5155, -0.0922),
-        },
-        "🏙️ Manchester City Centre (10km)": {
-            "start": (53.4808, -2.2426),
-            "end": (53.4723, -2.2360),
-        },
-        "🛣️ M25 West Section (50km)": {
-            "start": (51.4700, -0.4543),
-            "end": (51.6800, -0.5500),
-        },
-        "🌄 Peak District Rural (45km)": {
-            "start": (53.3498, -1.5912),
-            "end": (53.2058, -1.8842),
-        }
-    }
-
     # Initialize session state
     if 'selected_route' not in st.session_state:
         st.session_state.selected_route = "🚢 Dover to Milton Keynes (189km)"
@@ -563,19 +575,26 @@ elif mode == "Route Assessment":
     # Route selection
     route_preset = st.selectbox(
         "Choose preset route:",
-        list(preset_routes.keys()),
-        index=list(preset_routes.keys()).index(st.session_state.selected_route)
+        ROUTE_PRESET_NAMES,
+        index=ROUTE_PRESET_NAMES.index(st.session_state.selected_route)
     )
 
     if route_preset != st.session_state.selected_route:
         st.session_state.selected_route = route_preset
-        if route_preset != "Custom" and preset_routes[route_preset]:
-            st.session_state.start_lat = preset_routes[route_preset]["start"][0]
-            st.session_state.start_lon = preset_routes[route_preset]["start"][1]
-            st.session_state.end_lat = preset_routes[route_preset]["end"][0]
-            st.session_state.end_lon = preset_routes[route_preset]["end"][1]
+        if route_preset != "Custom" and ROUTE_PRESETS[route_preset]:
+            st.session_state.start_lat = ROUTE_PRESETS[route_preset]["start"][0]
+            st.session_state.start_lon = ROUTE_PRESETS[route_preset]["start"][1]
+            st.session_state.end_lat = ROUTE_PRESETS[route_preset]["end"][0]
+            st.session_state.end_lon = ROUTE_PRESETS[route_preset]["end"][1]
         st.rerun()
 
+    # No data for this preset: skip the coordinate inputs and button entirely
+    if route_preset not in SUPPORTED_ROUTES:
+        st.warning(
+            "❌ No data available for this route. Please select one of the supported routes:")
+        st.markdown("\n".join(f"- {r}" for r in SUPPORTED_ROUTES))
+        return
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -610,31 +629,10 @@ elif mode == "Route Assessment":
             key=f"end_lon_{st.session_state.selected_route}"  # ← Dynamic key!
         )
 
-    # Only allow assessment for available routes
-    available_routes = [
-        "🚢 Dover to Milton Keynes (189km)",
-        "🏙️ London to Birmingham (193km)",
-        "🏙️ Manchester to Leeds (64km)"
-    ]
-
-    route_supported = route_preset in available_routes
     assess_route_button = st.button(
-        "🔍 Assess Route", type="primary", use_container_width=True, disabled=not route_supported)
+        "🔍 Assess Route", type="primary", use_container_width=True)
 
-    if not route_supported:
-        st.warning(
-            "❌ No data available for this route. Please select one of the supported routes:")
-        for r in available_routes:
-            st.markdown(f"- {r}")
-
-    if route_preset != st.session_state.selected_route:
-        st.session_state.selected_route = route_preset
-        if route_preset != "Custom" and preset_routes[route_preset]:
-            st.session_state.start_lat = preset_routes[route_preset]["start"][0]
-            st.session_state.start_lon = preset_routes[route_preset]["start"][1]
-            st.session_state.end_lat = preset_routes[route_preset]["end"][0]
-            st.session_state.end_lon = preset_routes[route_preset]["end"][1]
-        st.rerun()
+    route_key = coord_key(start_lat, start_lon, end_lat, end_lon)
 
     if assess_route_button:
         with st.spinner(f"🗺️ Analyzing route ({route_preset})... This may take 10-15 seconds for longer routes..."):
@@ -646,130 +644,20 @@ elif mode == "Route Assessment":
             progress_bar.progress(25)
 
             try:
-                response = requests.get(
-                    f"{API_BASE_URL}/api/v1/route/assess",
-                    params={
-                        "start_lat": start_lat,
-                        "start_lon": start_lon,
-                        "end_lat": end_lat,
-                        "end_lon": end_lon
-                    },
-                    timeout=30
-                )
-
-                status_text.text("🧮 Processing segments...")
-                progress_bar.progress(75)
-
-                if response.status_code == 200:
-                    status_text.text("✅ Complete!")
-                    progress_bar.progress(100)
-
-                    # Clear progress indicators after 1 second
-                    import time
-                    time.sleep(1)
-                    progress_bar.empty()
-                    status_text.empty()
-                    route_data = response.json()
-
-                    # Store in session state ← ADD THIS
-                    st.session_state.route_results = route_data
-
-                    st.markdown("---")
-                    st.markdown("## 📊 Route Assessment Results")
-
-                    # Key metrics
-                    col1, col2, col3, col4 = st.columns(4)
-
-                    with col1:
-                        st.metric("Total Distance",
-                                  f"{route_data['total_distance_km']:.1f} km")
-
-                    with col2:
-                        st.metric(
-                            "Avg Readiness", f"{route_data['average_readiness_score']:.1f}%")
-
-                    with col3:
-                        risk_emoji = {'COMPLIANT': '🟢',
-                                      'MODERATE': '🟡', 'CRITICAL': '🔴'}
-                        st.metric(
-                            "Overall Risk",
-                            f"{risk_emoji.get(route_data['overall_risk_level'], '')} {route_data['overall_risk_level']}"
-                        )
-
-                    with col4:
-                        st.metric("Critical Segments", len(
-                            route_data['critical_segments']))
-
-                    # Map visualization
-                    st.markdown("### 🗺️ Route Visualization")
-
-                    # Prepare map data
-                    segments_df = pd.DataFrame([
-                        {
-                            'lat': s['latitude'],
-                            'lon': s['longitude'],
-                            'readiness_score': s['readiness_score'],
-                            'risk_level': s['risk_level']
-                        }
-                        for s in route_data['segments']
-                    ])
-
-                    # Color by risk level
-                    color_map = {'COMPLIANT': 'green',
-                                 'MODERATE': 'yellow', 'CRITICAL': 'red'}
-                    segments_df['color'] = segments_df['risk_level'].map(
-                        color_map)
-
-                    st.map(segments_df[['lat', 'lon']], zoom=7)
-
-                    # Readiness score distribution
-                    col1, col2 = st.columns(2)
-
-                    with col1:
-                        fig = px.histogram(
-                            segments_df,
-                            x='readiness_score',
-                            nbins=20,
-                            title='Readiness Score Distribution',
-                            color_discrete_sequence=['#1f77b4']
-                        )
-                        fig.update_layout(
-                            xaxis_title="Readiness Score (%)",
-                            yaxis_title="Number of Segments"
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-
-                    with col2:
-                        risk_counts = segments_df['risk_level'].value_counts()
-                        fig = px.pie(
-                            values=risk_counts.values,
-                            names=risk_counts.index,
-                            title='Risk Level Distribution',
-                            color=risk_counts.index,
-                            color_discrete_map=color_map
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-
-                    # Recommendations
-                    st.markdown("### 💡 Recommendations")
-                    for rec in route_data['recommendations']:
-                        st.info(rec)
-
-                    # Critical segments detail
-                    if route_data['critical_segments']:
-                        st.markdown(
-                            "### 🚨 Critical Segments Requiring Attention")
-                        critical_df = pd.DataFrame([
-                            {
-                                'Location': f"({s['latitude']:.4f}, {s['longitude']:.4f})",
-                                'Score': f"{s['readiness_score']:.1f}%",
-                                'Features': ', '.join(s['detected_features'][:3])
-                            }
-                            for s in route_data['critical_segments'][:10]
-                        ])
-                        st.dataframe(critical_df, use_container_width=True)
-
-                elif response.status_code == 404:
+                # Kept with its coordinates so later reruns (map zoom,
+                # unrelated widgets) re-render without re-fetching
+                st.session_state.route_results = {
+                    'key': route_key,
+                    'data': fetch_route(*route_key)
+                }
+
+                # Clear progress indicators straight away; the toast
+                # confirms completion without blocking the script
+                progress_bar.empty()
+                status_text.empty()
+                st.toast("Route assessment complete", icon="✅")
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code == 404:
                     st.error(f"""
                     ❌ **No Data Available for This Route**
     
@@ -784,12 +672,96 @@ elif mode == "Route Assessment":
                 """)
 
                 else:
-                    st.error(f"Error: {response.status_code}")
-
+                    st.error(f"Error: {e.response.status_code}")
             except Exception as e:
                 st.error(f"Error: {str(e)}")
 
-elif mode == "UK Overview":
+    results = st.session_state.get('route_results')
+    if results and results['key'] == route_key:
+        route_data = results['data']
+
+        st.markdown("---")
+        st.markdown("## 📊 Route Assessment Results")
+
+        # Key metrics
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("Total Distance",
+                      f"{route_data['total_distance_km']:.1f} km")
+
+        with col2:
+            st.metric(
+                "Avg Readiness", f"{route_data['average_readiness_score']:.1f}%")
+
+        with col3:
+            st.metric(
+                "Overall Risk",
+                f"{RISK_EMOJI.get(route_data['overall_risk_level'], '')} {route_data['overall_risk_level']}"
+            )
+
+        with col4:
+            st.metric("Critical Segments", len(
+                route_data['critical_segments']))
+
+        # Map visualization
+        st.markdown("### 🗺️ Route Visualization")
+
+        # Prepare map data
+        segs = route_data['segments']
+        n = len(segs)
+        segments_df = pd.DataFrame({
+            'lat': np.fromiter((s['latitude'] for s in segs),
+                               dtype=np.float32, count=n),
+            'lon': np.fromiter((s['longitude'] for s in segs),
+                               dtype=np.float32, count=n),
+            'readiness_score': np.fromiter(
+                (s['readiness_score'] for s in segs),
+                dtype=np.float32, count=n),
+            'risk_level': pd.Categorical(
+                [s['risk_level'] for s in segs],
+                categories=RISK_LEVELS)
+        })
+
+        st.pydeck_chart(route_deck(route_key, segments_df))
+
+        # Readiness score distribution
+        col1, col2 = st.columns(2)
+
+        with col1:
+            show_figure(score_histogram_json(
+                tuple(segments_df['readiness_score'].tolist())))
+
+        with col2:
+            risk_counts = segments_df['risk_level'].value_counts()
+            # Categorical counts include absent levels; keep the
+            # pie to the levels actually present on the route
+            risk_counts = risk_counts[risk_counts > 0]
+            show_figure(risk_pie_json(
+                tuple(risk_counts.items())))
+
+        # Recommendations
+        st.markdown("### 💡 Recommendations")
+        st.info("\n\n".join(route_data['recommendations']))
+
+        # Critical segments detail
+        if route_data['critical_segments']:
+            st.markdown(
+                "### 🚨 Critical Segments Requiring Attention")
+            critical = pd.DataFrame(
+                route_data['critical_segments'][:10])
+            critical_df = pd.DataFrame({
+                'Location': "(" + critical['latitude'].map("{:.4f}".format) +
+                            ", " + critical['longitude'].map("{:.4f}".format) + ")",
+                'Score': critical['readiness_score'].map("{:.1f}%".format),
+                'Features': critical['detected_features'].str[:3].str.join(', ')
+            })
+            st.dataframe(critical_df, use_container_width=True)
+
+
+@st.fragment
+def render_overview(stats_future):
+    """UK Overview page (stats come from the sidebar's stats request)."""
     st.markdown('<div class="main-header">R10 - AV Route Assessment</div>',
                 unsafe_allow_html=True)
     st.markdown('<div class="sub-header">AI-Powered Infrastructure Assessment for Autonomous Vehicles</div>',
@@ -800,70 +772,71 @@ elif mode == "UK Overview":
         "National-level insights into road infrastructure readiness for autonomous vehicles.")
 
     try:
-        stats_response = requests.get(
-            f"{API_BASE_URL}/api/v1/stats", timeout=10)
+        stats = stats_future.result(timeout=30)
 
-        if stats_response.status_code == 200:
-            stats = stats_response.json()
+        # National metrics
+        col1, col2, col3 = st.columns(3)
 
-            # National metrics
-            col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Coverage", f"{stats['coverage_km']:.0f} km")
 
-            with col1:
-                st.metric("Total Coverage", f"{stats['coverage_km']:.0f} km")
+        with col2:
+            st.metric("Segments Assessed",
+                      f"{stats['total_segments_assessed']:,}")
 
-            with col2:
-                st.metric("Segments Assessed",
-                          f"{stats['total_segments_assessed']:,}")
+        with col3:
+            st.metric("National Avg Score",
+                      f"{stats['average_readiness_score']:.1f}%")
 
-            with col3:
-                st.metric("National Avg Score",
-                          f"{stats['average_readiness_score']:.1f}%")
+        # Risk distribution
+        st.markdown("### 📈 National Risk Distribution")
 
-            # Risk distribution
-            st.markdown("### 📈 National Risk Distribution")
+        show_figure(risk_bar_json(
+            tuple(stats['risk_distribution'].items())))
 
-            risk_data = pd.DataFrame({
-                'Risk Level': list(stats['risk_distribution'].keys()),
-                'Count': list(stats['risk_distribution'].values())
-            })
+        # Key findings
+        st.markdown("### 🔍 Key Findings")
 
-            fig = px.bar(
-                risk_data,
-                x='Risk Level',
-                y='Count',
-                title='Road Segments by Risk Category',
-                color='Risk Level',
-                color_discrete_map={'COMPLIANT': 'green',
-                                    'MODERATE': 'yellow', 'CRITICAL': 'red'}
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        compliant_pct = (
+            stats['risk_distribution']['COMPLIANT'] / stats['total_segments_assessed']) * 100
 
-            # Key findings
-            st.markdown("### 🔍 Key Findings")
+        col1, col2 = st.columns(2)
 
-            compliant_pct = (
-                stats['risk_distribution']['COMPLIANT'] / stats['total_segments_assessed']) * 100
+        with col1:
+            st.success(f"""
+            **Deployment Ready**  
+            {compliant_pct:.1f}% of assessed routes meet minimum readiness criteria
+            """)
 
-            col1, col2 = st.columns(2)
+        with col2:
+            st.warning(f"""
+            **Requires Attention**  
+            {stats['risk_distribution']['CRITICAL']} critical segments identified
+            """)
 
-            with col1:
-                st.success(f"""
-                **Deployment Ready**  
-                {compliant_pct:.1f}% of assessed routes meet minimum readiness criteria
-                """)
+    except requests.exceptions.HTTPError:
+        st.error("Unable to load national statistics")
+    except Exception as e:
+        st.error(f"Error loading overview: {str(e)}")
 
-            with col2:
-                st.warning(f"""
-                **Requires Attention**  
-                {stats['risk_distribution']['CRITICAL']} critical segments identified
-                """)
 
-        else:
-            st.error("Unable to load national statistics")
+# Main content area
+if mode == "Location Assessment":
+    render_location()
+elif mode == "Route Assessment":
+    render_route()
+elif mode == "UK Overview":
+    render_overview(stats_future)
 
+with stats_slot:
+    try:
+        stats = stats_future.result(timeout=10)
+        st.metric("Total Segments",
+                  f"{stats['total_segments_assessed']:,}")
+        st.metric("Avg Readiness", f"{stats['average_readiness_score']}%")
+        st.metric("Coverage", f"{stats['coverage_km']} km")
     except Exception as e:
-        st.error(f"Error loading overview: {str(e)}")
+        st.warning("Unable to load stats")
 
 # Footer
 st.markdown("---")
@@ -4,33 +4,196 @@ Route10 AI - Enterprise Demo
 """
 
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, Union
+import functools
+import itertools
 import json
 import math
-from datetime import datetime
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from mock_data_generator import (FEATURE_INDEX, HAVE_NUMBA, MAJOR_ROUTES,
+                                 RISK_LEVEL_NAMES, njit, orjson)
+
+try:
+    from rtree import index as rtree_index
+except ImportError:  # libspatialindex unavailable: fall back to a linear scan
+    rtree_index = None
+
+# ORJSONResponse needs orjson at render time; stdlib json is the fallback
+APIResponse = ORJSONResponse if orjson is not None else JSONResponse
 
 app = FastAPI(
     title="Route10 AI - CAV Road Readiness API",
     description="Assess UK road infrastructure readiness for Connected Autonomous Vehicles",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=APIResponse
 )
 
+
+class OpenCORSMiddleware:
+    """Fully open CORS as a minimal ASGI middleware.
+
+    Appends a fixed ``access-control-allow-origin: *`` header to every
+    response and answers preflight requests itself, skipping the origin
+    matching CORSMiddleware does per request.
+    """
+
+    ALLOW_ORIGIN = [(b"access-control-allow-origin", b"*")]
+    PREFLIGHT = ALLOW_ORIGIN + [
+        (b"access-control-allow-methods",
+         b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+        (b"access-control-max-age", b"600"),
+        (b"vary", b"Origin"),
+    ]
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if (scope["method"] == "OPTIONS" and
+                b"access-control-request-method" in headers):
+            # Allow whatever headers the preflight asks for
+            requested = headers.get(b"access-control-request-headers")
+            await send({
+                "type": "http.response.start",
+                "status": 204,
+                "headers": self.PREFLIGHT + (
+                    [(b"access-control-allow-headers", requested)]
+                    if requested else []),
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()),
+                                      *self.ALLOW_ORIGIN]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
 # CORS for frontend integration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(OpenCORSMiddleware)
 
 # Load mock data (in production, use Cloud SQL/Firestore)
-with open('mock_cav_readiness_data.json', 'r') as f:
-    ROAD_SEGMENTS = json.load(f)
+DATA_PATH = Path('mock_cav_readiness_data.json')
+
+RISK_CODE = {name: code for code, name in enumerate(RISK_LEVEL_NAMES)}
+
+# detected_features encoded as a bitmask, one bit per RISK_FEATURES entry
+# (mask value per feature, from the generator's bit positions)
+FEATURE_BIT = {feature: np.uint32(1 << i)
+               for feature, i in FEATURE_INDEX.items()}
+
+
+def load_segments(path: Path) -> List[Dict]:
+    """Parse the segment JSON, with orjson when it is installed."""
+    raw = path.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def build_columns(segments: List[Dict]) -> Dict[str, np.ndarray]:
+    """Scalar segment fields as column arrays (structure of arrays)."""
+    return {
+        'lat': np.array([s['latitude'] for s in segments], dtype=np.float64),
+        'lon': np.array([s['longitude'] for s in segments], dtype=np.float64),
+        'scores': np.array([s['readiness_score'] for s in segments],
+                           dtype=np.float32),
+        'risk_levels': np.array([RISK_CODE[s['risk_level']] for s in segments],
+                                dtype=np.int8),
+        'lane_markings': np.array(
+            [s['infrastructure_quality']['lane_markings'] for s in segments],
+            dtype=np.float32),
+        'feature_mask': np.array(
+            [sum(int(FEATURE_BIT[f]) for f in set(s['detected_features']))
+             for s in segments],
+            dtype=np.uint32),
+    }
+
+
+def build_segment_index(lats: np.ndarray, lons: np.ndarray,
+                        lon_scale: float) -> Optional["rtree_index.Index"]:
+    """Build an R-tree over segment points, keyed by position in the arrays.
+
+    Longitudes are multiplied by ``lon_scale``; queries must scale theirs
+    the same way. Returns None when rtree is not installed. Rebuild
+    whenever the segment list is reloaded.
+    """
+    if rtree_index is None:
+        return None
+    # Stream-load (bulk insert) the points as degenerate boxes, with
+    # longitude scaled so box distances track ground ones
+    return rtree_index.Index(
+        (i, (x, lat, x, lat), None)
+        for i, (lat, x) in enumerate(zip(
+            lats.tolist(), (lons * lon_scale).tolist()))
+    )
+
+
+ROAD_SEGMENTS = load_segments(DATA_PATH)
+COLUMNS = build_columns(ROAD_SEGMENTS)
+
+# Contiguous coordinate columns for vectorised corridor filtering
+SEG_LAT = COLUMNS['lat']
+SEG_LON = COLUMNS['lon']
+
+# Scalar fields as column arrays so aggregates are single C-level
+# reductions rather than per-dict lookups
+SCORES = COLUMNS['scores']
+RISK_LEVELS = COLUMNS['risk_levels']
+LANE_MARKINGS = COLUMNS['lane_markings']
+FEATURE_MASK = COLUMNS['feature_mask']
+
+# Segment indices per risk level, so counts are a len() and route
+# filtering an intersection with the corridor indices
+RISK_INDEX = {name: np.flatnonzero(RISK_LEVELS == code)
+              for name, code in RISK_CODE.items()}
+
+# Longitude degrees shrink by cos(latitude); one factor at the dataset's
+# mean latitude is close enough for UK-scale extents
+INDEX_LON_SCALE = math.cos(math.radians(float(SEG_LAT.mean()))) \
+    if len(SEG_LAT) else 1.0
+SEGMENT_INDEX = build_segment_index(SEG_LAT, SEG_LON, INDEX_LON_SCALE)
+# libspatialindex queries are not thread-safe, and sync endpoints run in
+# FastAPI's threadpool, so lookups on SEGMENT_INDEX are serialised
+SEGMENT_INDEX_LOCK = threading.Lock()
+
+# R-tree neighbours are ranked in the scaled plane, which drifts from true
+# distance away from the mean latitude, so take a few and rank by haversine
+NEAREST_CANDIDATES = 4
+
+
+def build_route_index(segments: List[Dict]) -> Dict[str, np.ndarray]:
+    """Sorted segment indices per generated route, keyed by route_name."""
+    groups = {}
+    for i, s in enumerate(segments):
+        if 'route_name' in s:
+            groups.setdefault(s['route_name'], []).append(i)
+    return {name: np.array(ids, dtype=np.intp) for name, ids in groups.items()}
+
+
+ROUTE_INDEX = build_route_index(ROAD_SEGMENTS)
+
+# Query endpoints this close to a MAJOR_ROUTES start/end (either way
+# round) only search that route's segments
+ROUTE_MATCH_KM = 10
+
+# Suffix keeping route ids unique within a process, even within one second
+ROUTE_COUNTER = itertools.count()
 
 # Response models
 
@@ -64,13 +227,24 @@ class RouteAssessment(BaseModel):
     critical_segments: List[RoadSegment]
     recommendations: List[str]
 
+
+# Segment dicts trimmed to the RoadSegment fields. The data is generated
+# rather than user input, so responses are built from these directly and
+# the models above only describe the schema
+SEGMENT_PAYLOADS = [{field: s[field] for field in RoadSegment.model_fields}
+                    for s in ROAD_SEGMENTS]
+
 # Utility functions
 
 
-def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate distance between two coordinates in km."""
-    R = 6371  # Earth radius in km
+EARTH_RADIUS_KM = 6371
+# Equirectangular scale factors (longitude is scaled by cos(latitude))
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LON_EQUATOR = 111.320
+
 
+@njit(fastmath=True, cache=True)
+def _haversine_scalar(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     lat1_rad = math.radians(lat1)
     lat2_rad = math.radians(lat2)
     delta_lat = math.radians(lat2 - lat1)
@@ -80,129 +254,244 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
         math.cos(lat2_rad) * math.sin(delta_lon/2)**2
     c = 2 * math.asin(math.sqrt(a))
 
-    return R * c
+    return EARTH_RADIUS_KM * c
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Calculate distance between two coordinates in km."""
+    return _haversine_scalar(lat1, lon1, lat2, lon2)
+
+
+def haversine_vector(lat1_arr: np.ndarray, lon1_arr: np.ndarray,
+                     lat2: float, lon2: float) -> np.ndarray:
+    """Distances in km from each (lat1, lon1) pair to one point."""
+    lat1_rad = np.radians(lat1_arr)
+    lat2_rad = math.radians(lat2)
+    delta_lat = lat2_rad - lat1_rad
+    delta_lon = np.radians(lon2 - lon1_arr)
+
+    a = np.sin(delta_lat/2)**2 + np.cos(lat1_rad) * \
+        math.cos(lat2_rad) * np.sin(delta_lon/2)**2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+@njit(fastmath=True, cache=True)
+def _nearest(lat: float, lon: float,
+             lats: np.ndarray, lons: np.ndarray) -> Tuple[int, float]:
+    """Index of, and km distance to, the closest of ``lats``/``lons``."""
+    lat_rad = math.radians(lat)
+    cos_lat = math.cos(lat_rad)
+    best = -1
+    best_a = math.inf
+
+    # Rank by the haversine term ``a``, which is monotonic in distance, so
+    # the arcsin/sqrt run once for the winner only
+    for i in range(lats.shape[0]):
+        seg_lat_rad = math.radians(lats[i])
+        a = math.sin((seg_lat_rad - lat_rad) / 2)**2 + \
+            cos_lat * math.cos(seg_lat_rad) * \
+            math.sin(math.radians(lons[i] - lon) / 2)**2
+        if a < best_a:
+            best_a = a
+            best = i
+
+    return best, 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(best_a))
+
+
+def find_nearest_segment_index(lat: float, lon: float,
+                               max_distance_km: float = 1.0) -> Optional[int]:
+    """Index into ROAD_SEGMENTS of the nearest segment within range."""
+    if SEGMENT_INDEX is not None:
+        x = lon * INDEX_LON_SCALE
+        # nearest() yields lazily, so drain it while holding the lock
+        with SEGMENT_INDEX_LOCK:
+            candidates = np.fromiter(SEGMENT_INDEX.nearest(
+                (x, lat, x, lat), NEAREST_CANDIDATES), dtype=np.intp)
+    elif HAVE_NUMBA:
+        candidates = None
+    else:
+        candidates = np.arange(len(SEG_LAT))
+
+    if candidates is None:
+        # Full scan fused into one compiled pass
+        if not len(SEG_LAT):
+            return None
+        best, distance = _nearest(lat, lon, SEG_LAT, SEG_LON)
+    else:
+        if not len(candidates):
+            return None
+        # All candidate distances in one vector op
+        distances = haversine_vector(
+            SEG_LAT[candidates], SEG_LON[candidates], lat, lon)
+        pos = int(np.argmin(distances))
+        best, distance = int(candidates[pos]), distances[pos]
+
+    if distance > max_distance_km:
+        return None
+    return best
 
 
 def find_nearest_segment(lat: float, lon: float, max_distance_km: float = 1.0) -> Optional[Dict]:
     """Find nearest road segment to given coordinates."""
-    nearest = None
-    min_distance = float('inf')
+    best = find_nearest_segment_index(lat, lon, max_distance_km)
+    return None if best is None else ROAD_SEGMENTS[best]
 
-    for segment in ROAD_SEGMENTS:
-        distance = haversine_distance(
-            lat, lon, segment['latitude'], segment['longitude'])
-        if distance < min_distance and distance <= max_distance_km:
-            min_distance = distance
-            nearest = segment
 
-    return nearest
+def point_to_line_distance(px: Union[float, np.ndarray],
+                           py: Union[float, np.ndarray],
+                           x1: float, y1: float,
+                           x2: float, y2: float) -> Union[float, np.ndarray]:
+    """Calculate perpendicular distance from point(s) to line segment.
 
-
-def point_to_line_distance(px, py, x1, y1, x2, y2):
-    """Calculate perpendicular distance from point to line segment."""
+    ``px``/``py`` may be scalars or NumPy arrays of points.
+    """
     # Vector from start to end
     dx = x2 - x1
     dy = y2 - y1
+    length_sq = dx**2 + dy**2
 
-    if dx == 0 and dy == 0:
+    if length_sq == 0:
         # Start and end are the same point
-        return math.sqrt((px - x1)**2 + (py - y1)**2)
+        return np.hypot(px - x1, py - y1)
 
     # Calculate the parameter t for the projection
-    t = max(0, min(1, ((px - x1) * dx + (py - y1) * dy) / (dx**2 + dy**2)))
+    t = np.clip(((px - x1) * dx + (py - y1) * dy) / length_sq, 0, 1)
+
+    # Return distance to the closest point on the line segment
+    return np.hypot(px - (x1 + t * dx), py - (y1 + t * dy))
+
 
-    # Find the closest point on the line segment
-    closest_x = x1 + t * dx
-    closest_y = y1 + t * dy
+def match_route(start_lat: float, start_lon: float,
+                end_lat: float, end_lon: float) -> Optional[str]:
+    """Name of the indexed MAJOR_ROUTES entry the query endpoints match."""
+    for route in MAJOR_ROUTES:
+        if route['name'] not in ROUTE_INDEX:
+            continue
+        a, b = route['start'], route['end']
+        for first, last in ((a, b), (b, a)):
+            if (haversine_distance(start_lat, start_lon,
+                                   first['lat'], first['lon']) <= ROUTE_MATCH_KM and
+                    haversine_distance(end_lat, end_lon,
+                                       last['lat'], last['lon']) <= ROUTE_MATCH_KM):
+                return route['name']
+    return None
+
+
+def find_route_segment_indices(start_lat: float, start_lon: float,
+                               end_lat: float, end_lon: float,
+                               corridor_width_km: float = 5.0) -> np.ndarray:
+    """Indices into ROAD_SEGMENTS of segments within the route corridor."""
+    # Local equirectangular projection: longitude degrees shrink with
+    # cos(latitude), taken at the route's mid-latitude
+    km_per_deg_lon = KM_PER_DEG_LON_EQUATOR * \
+        math.cos(math.radians((start_lat + end_lat) / 2))
+
+    # Convert corridor width to degrees along each axis
+    lat_pad = corridor_width_km / KM_PER_DEG_LAT
+    lon_pad = corridor_width_km / km_per_deg_lon
+
+    lat_min = min(start_lat, end_lat) - lat_pad
+    lat_max = max(start_lat, end_lat) + lat_pad
+    lon_min = min(start_lon, end_lon) - lon_pad
+    lon_max = max(start_lon, end_lon) + lon_pad
+
+    # Restrict a known route to its own segments, else search them all
+    route_name = match_route(start_lat, start_lon, end_lat, end_lon)
+    if route_name is None:
+        pool, lats, lons = None, SEG_LAT, SEG_LON
+    else:
+        pool = ROUTE_INDEX[route_name]
+        lats, lons = SEG_LAT[pool], SEG_LON[pool]
 
-    # Return distance to closest point
-    return math.sqrt((px - closest_x)**2 + (py - closest_y)**2)
+    # Bounding box quick reject, then perpendicular distance for survivors
+    candidates = np.flatnonzero(
+        (lats >= lat_min) & (lats <= lat_max) &
+        (lons >= lon_min) & (lons <= lon_max)
+    )
+    if pool is not None:
+        candidates = pool[candidates]
+
+    # Project onto a km plane with the route start at the origin
+    perp_distance_km = point_to_line_distance(
+        (SEG_LON[candidates] - start_lon) * km_per_deg_lon,  # Points
+        (SEG_LAT[candidates] - start_lat) * KM_PER_DEG_LAT,
+        0.0, 0.0,  # Line start
+        (end_lon - start_lon) * km_per_deg_lon,  # Line end
+        (end_lat - start_lat) * KM_PER_DEG_LAT
+    )
+
+    return candidates[perp_distance_km <= corridor_width_km]
 
 
 def find_route_segments(start_lat: float, start_lon: float,
                         end_lat: float, end_lon: float,
                         corridor_width_km: float = 5.0) -> List[Dict]:
     """Find segments along route corridor using perpendicular distance."""
-    route_segments = []
-
-    # Convert corridor width to approximate degrees
-    corridor_degrees = corridor_width_km / 111  # ~111km per degree latitude
-
-    for segment in ROAD_SEGMENTS:
-        seg_lat = segment['latitude']
-        seg_lon = segment['longitude']
+    return [ROAD_SEGMENTS[i] for i in find_route_segment_indices(
+        start_lat, start_lon, end_lat, end_lon, corridor_width_km)]
 
-        # First check bounding box for performance (quick reject)
-        lat_min = min(start_lat, end_lat) - corridor_degrees
-        lat_max = max(start_lat, end_lat) + corridor_degrees
-        lon_min = min(start_lon, end_lon) - corridor_degrees
-        lon_max = max(start_lon, end_lon) + corridor_degrees
 
-        if not (lat_min <= seg_lat <= lat_max and lon_min <= seg_lon <= lon_max):
-            continue
+def sample_segments_evenly(segments: Union[List[Dict], np.ndarray],
+                           max_samples: int = 200) -> Union[List[Dict], np.ndarray]:
+    """Sample segments evenly across the route for visualization.
 
-        # Calculate perpendicular distance to route line
-        perp_distance_degrees = point_to_line_distance(
-            seg_lon, seg_lat,  # Point
-            start_lon, start_lat,  # Line start
-            end_lon, end_lat  # Line end
-        )
+    ``segments`` may be a list or a NumPy array of segment indices; an
+    array is sampled with a single take.
+    """
+    if len(segments) <= max_samples:
+        return segments
 
-        # Convert to approximate km (rough approximation)
-        perp_distance_km = perp_distance_degrees * 111
+    # Evenly spaced positions from the first to the last segment
+    picks = np.linspace(0, len(segments) - 1, max_samples, dtype=np.intp)
 
-        # Only include if within corridor
-        if perp_distance_km <= corridor_width_km:
-            route_segments.append(segment)
+    if isinstance(segments, np.ndarray):
+        return segments[picks]
+    return [segments[i] for i in picks]
 
-    return route_segments
 
+# Recommendation texts; counted ones are filled in with str.format(n=...)
+REC_TEMPLATES = {
+    "critical": "⚠️ {n} critical risk segments detected - manual review recommended",
+    "lane_quality": "🛣️ Lane marking quality below threshold - consider alternative route or infrastructure upgrade",
+    "roundabouts": "🔄 {n} roundabouts detected - ensure AV is validated for UK-style roundabouts",
+    "construction": "🚧 {n} construction zones - check for real-time updates before deployment",
+    "ready": "✅ Route meets minimum readiness criteria for AV deployment",
+}
 
-def sample_segments_evenly(segments: List[Dict], max_samples: int = 200) -> List[Dict]:
-    """Sample segments evenly across the route for visualization."""
-    if len(segments) <= max_samples:
-        return segments
 
-    # Calculate step size to get evenly distributed samples
-    step = len(segments) / max_samples
-    sampled = []
+def count_feature(masks: np.ndarray, feature: str) -> int:
+    """Number of segment bitmasks with ``feature`` set."""
+    return int(np.count_nonzero(masks & FEATURE_BIT[feature]))
 
-    for i in range(max_samples):
-        idx = int(i * step)
-        sampled.append(segments[idx])
 
-    return sampled
+def generate_recommendations(indices: np.ndarray) -> List[str]:
+    """Generate actionable recommendations based on route analysis.
 
+    ``indices`` selects the route's segments from the column arrays.
+    """
+    masks = FEATURE_MASK[indices]
+    counts = {
+        "critical": int(np.count_nonzero(
+            RISK_LEVELS[indices] == RISK_CODE['CRITICAL'])),
+        "roundabouts": count_feature(masks, 'roundabout'),
+        "construction": count_feature(masks, 'construction_zone'),
+    }
+    low_lane_quality = float(LANE_MARKINGS[indices].mean()) < 0.6
 
-def generate_recommendations(segments: List[Dict]) -> List[str]:
-    """Generate actionable recommendations based on route analysis."""
     recommendations = []
-
-    critical_count = sum(1 for s in segments if s['risk_level'] == 'CRITICAL')
-    avg_lane_quality = sum(s['infrastructure_quality']['lane_markings']
-                           for s in segments) / len(segments)
-
-    if critical_count > 0:
+    if counts["critical"] > 0:
         recommendations.append(
-            f"⚠️ {critical_count} critical risk segments detected - manual review recommended")
-
-    if avg_lane_quality < 0.6:
+            REC_TEMPLATES["critical"].format(n=counts["critical"]))
+    if low_lane_quality:
+        recommendations.append(REC_TEMPLATES["lane_quality"])
+    if counts["roundabouts"] > 3:
         recommendations.append(
-            "🛣️ Lane marking quality below threshold - consider alternative route or infrastructure upgrade")
-
-    roundabouts = sum(
-        1 for s in segments if 'roundabout' in s['detected_features'])
-    if roundabouts > 3:
+            REC_TEMPLATES["roundabouts"].format(n=counts["roundabouts"]))
+    if counts["construction"] > 0:
         recommendations.append(
-            f"🔄 {roundabouts} roundabouts detected - ensure AV is validated for UK-style roundabouts")
+            REC_TEMPLATES["construction"].format(n=counts["construction"]))
 
-    construction = sum(
-        1 for s in segments if 'construction_zone' in s['detected_features'])
-    if construction > 0:
-        recommendations.append(
-            f"🚧 {construction} construction zones - check for real-time updates before deployment")
-
-    return recommendations if recommendations else ["✅ Route meets minimum readiness criteria for AV deployment"]
+    return recommendations or [REC_TEMPLATES["ready"]]
 
 # API Endpoints
 
@@ -216,52 +505,60 @@ def root():
         "endpoints": {
             "assess_route": "/api/v1/route/assess",
             "location_readiness": "/api/v1/location/readiness",
+            "cache_stats": "/api/v1/cache",
             "documentation": "/docs"
         }
     }
 
 
-@app.get("/api/v1/location/readiness", response_model=RoadSegment)
-def get_location_readiness(
-    lat: float = Query(..., description="Latitude"),
-    lon: float = Query(..., description="Longitude")
-):
-    """Get CAV readiness score for a specific location."""
+# Keyed on the exact query floats: rounding the key would also round the
+# point the search runs from, and flip results near the 500m cutoff
+@functools.lru_cache(maxsize=4096)
+def _nearest_location(lat: float, lon: float) -> Optional[int]:
+    return find_nearest_segment_index(lat, lon, max_distance_km=0.5)
+
+
+def build_location_readiness(lat: float, lon: float) -> Dict:
+    """RoadSegment fields of the nearest segment, without model validation."""
 
-    segment = find_nearest_segment(lat, lon, max_distance_km=0.5)
+    best = _nearest_location(lat, lon)
 
-    if not segment:
+    if best is None:
         raise HTTPException(
             status_code=404,
             detail="No road segment found within 500m of specified location"
         )
 
-    return RoadSegment(**segment)
+    return SEGMENT_PAYLOADS[best]
 
 
-@app.get("/api/v1/route/assess", response_model=RouteAssessment)
-def assess_route(
-    start_lat: float = Query(..., description="Start latitude"),
-    start_lon: float = Query(..., description="Start longitude"),
-    end_lat: float = Query(..., description="End latitude"),
-    end_lon: float = Query(..., description="End longitude"),
-    vehicle_type: Optional[str] = Query(
-        "generic", description="AV vehicle type (future use)")
+@app.get("/api/v1/location/readiness", response_model=RoadSegment)
+def get_location_readiness(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude")
 ):
-    """Assess CAV readiness for a route between two points."""
+    """Get CAV readiness score for a specific location."""
+    return APIResponse(build_location_readiness(lat, lon))
+
 
+@functools.lru_cache(maxsize=4096)
+def _assess(start_lat: float, start_lon: float,
+            end_lat: float, end_lon: float) -> Optional[Dict]:
+    """Route metrics for the exact endpoints, or None when nothing is found."""
     # Find all segments along route
-    segments = find_route_segments(start_lat, start_lon, end_lat, end_lon)
+    indices = find_route_segment_indices(
+        start_lat, start_lon, end_lat, end_lon)
 
-    if not segments:
-        raise HTTPException(
-            status_code=404,
-            detail="No road segments found along specified route"
-        )
+    if not len(indices):
+        return None
 
     # Calculate metrics
-    avg_score = sum(s['readiness_score'] for s in segments) / len(segments)
-    critical_segments = [s for s in segments if s['risk_level'] == 'CRITICAL']
+    avg_score = float(SCORES[indices].mean())
+    critical_segments = [
+        SEGMENT_PAYLOADS[i]
+        for i in np.intersect1d(indices, RISK_INDEX['CRITICAL'],
+                                assume_unique=True)
+    ]
 
     # Determine overall risk level
     if avg_score >= 75:
@@ -275,20 +572,53 @@ def assess_route(
     total_distance = haversine_distance(start_lat, start_lon, end_lat, end_lon)
 
     # Generate recommendations
-    recommendations = generate_recommendations(segments)
+    recommendations = generate_recommendations(indices)
 
     # Sample segments for visualization (AFTER calculations)
-    display_segments = sample_segments_evenly(segments, max_samples=1000)
-
-    return RouteAssessment(
-        route_id=f"route_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-        total_distance_km=round(total_distance, 2),
-        average_readiness_score=round(avg_score, 1),
-        overall_risk_level=overall_risk,
-        segments=[RoadSegment(**s) for s in display_segments],
-        critical_segments=[RoadSegment(**s) for s in critical_segments],
-        recommendations=recommendations
-    )
+    display_segments = [SEGMENT_PAYLOADS[i] for i in
+                        sample_segments_evenly(indices, max_samples=1000)]
+
+    return {
+        "total_distance_km": round(total_distance, 2),
+        "average_readiness_score": round(avg_score, 1),
+        "overall_risk_level": overall_risk,
+        "segments": display_segments,
+        "critical_segments": critical_segments,
+        "recommendations": recommendations
+    }
+
+
+def build_route_assessment(start_lat: float, start_lon: float,
+                           end_lat: float, end_lon: float) -> Dict:
+    """RouteAssessment fields as a plain dict, without model validation."""
+    assessment = _assess(start_lat, start_lon, end_lat, end_lon)
+
+    if assessment is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No road segments found along specified route"
+        )
+
+    # Only the route id is per request; the cached metrics are shared
+    return {"route_id": f"route_{int(time.time())}_{next(ROUTE_COUNTER)}",
+            **assessment}
+
+
+@app.get("/api/v1/route/assess", response_model=RouteAssessment)
+def assess_route(
+    start_lat: float = Query(..., ge=-90, le=90, description="Start latitude"),
+    start_lon: float = Query(..., ge=-180, le=180,
+                             description="Start longitude"),
+    end_lat: float = Query(..., ge=-90, le=90, description="End latitude"),
+    end_lon: float = Query(..., ge=-180, le=180, description="End longitude"),
+    vehicle_type: Optional[str] = Query(
+        "generic", description="AV vehicle type (future use)")
+):
+    """Assess CAV readiness for a route between two points."""
+    # Returning a Response skips response_model validation; the model
+    # still documents the schema
+    return APIResponse(build_route_assessment(
+        start_lat, start_lon, end_lat, end_lon))
 
 
 @app.get("/api/v1/stats")
@@ -296,14 +626,10 @@ def get_statistics():
     """Get aggregate statistics across all assessed roads."""
 
     total_segments = len(ROAD_SEGMENTS)
-    avg_score = sum(s['readiness_score']
-                    for s in ROAD_SEGMENTS) / total_segments
+    avg_score = float(SCORES.mean())
 
-    risk_distribution = {
-        'COMPLIANT': sum(1 for s in ROAD_SEGMENTS if s['risk_level'] == 'COMPLIANT'),
-        'MODERATE': sum(1 for s in ROAD_SEGMENTS if s['risk_level'] == 'MODERATE'),
-        'CRITICAL': sum(1 for s in ROAD_SEGMENTS if s['risk_level'] == 'CRITICAL')
-    }
+    risk_distribution = {name: len(RISK_INDEX[name])
+                         for name in RISK_LEVEL_NAMES}
 
     return {
         "total_segments_assessed": total_segments,
@@ -313,6 +639,16 @@ def get_statistics():
     }
 
 
+@app.get("/api/v1/cache")
+def get_cache_info():
+    """Hit/miss counts and sizes of the coordinate-keyed response caches."""
+    return {
+        name: cache.cache_info()._asdict()
+        for name, cache in (("location", _nearest_location),
+                            ("route", _assess))
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8080)
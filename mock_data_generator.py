@@ -4,10 +4,30 @@ Based on Route10 AI's 21-feature taxonomy.
 """
 
 import json
-import random
 from typing import Dict, List
 from datetime import datetime
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional accelerators, shared with main.py: orjson for JSON, numba for
+# the numeric kernels
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # run the kernels as plain Python
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
 # Feature taxonomy from your prototype
 RISK_FEATURES = [
     'construction_zone', 'lane_merge', 'motorway_signage', 'multiple_lanes',
@@ -62,85 +82,140 @@ MAJOR_ROUTES = [
 ]
 
 
-def generate_segment_data(route: Dict, segment_idx: int, total_segments: int) -> Dict:
-    """Generate realistic mock data for a road segment."""
-
-    # Interpolate position along route
-    progress = segment_idx / total_segments
-    lat = route['start']['lat'] + \
-        (route['end']['lat'] - route['start']['lat']) * progress
-    lon = route['start']['lon'] + \
-        (route['end']['lon'] - route['start']['lon']) * progress
-
-    # Base readiness score (60-95 for motorways, lower for urban)
-    base_score = random.uniform(
-        70, 90) if 'motorway' in route['road_types'] else random.uniform(50, 75)
-
-    # Randomly assign features based on road type
-    detected_features = []
-    risk_adjustments = 0
-
-    if 'motorway' in route['road_types']:
-        # Motorway-typical features
-        if random.random() > 0.7:
-            detected_features.append('multiple_lanes')
-            risk_adjustments -= RISK_WEIGHTS.get('multiple_lanes', 0)
-        if random.random() > 0.8:
-            detected_features.append('hard_shoulder')
-            risk_adjustments -= RISK_WEIGHTS.get('hard_shoulder', 0)
-        if random.random() > 0.95:
-            detected_features.append('construction_zone')
-            risk_adjustments += RISK_WEIGHTS.get('construction_zone', 0)
-    else:
-        # Urban/residential features
-        if random.random() > 0.6:
-            detected_features.append('urban')
-            risk_adjustments += RISK_WEIGHTS.get('urban', 0)
-        if random.random() > 0.7:
-            detected_features.append('pedestrian_crossing')
-            risk_adjustments += RISK_WEIGHTS.get('pedestrian_crossing', 0)
-        if random.random() > 0.85:
-            detected_features.append('roundabout')
-            risk_adjustments += RISK_WEIGHTS.get('roundabout', 0)
-
-    # Random challenging conditions
-    if random.random() > 0.92:
-        detected_features.append('junction')
-        risk_adjustments += RISK_WEIGHTS.get('junction', 0)
-
-    # Calculate final score (clamped 0-100)
-    final_score = max(0, min(100, base_score - (risk_adjustments * 20)))
+# Generated features per road type, in the order they are rolled (and listed)
+MOTORWAY_FEATURES = ('multiple_lanes', 'hard_shoulder', 'construction_zone')
+URBAN_FEATURES = ('urban', 'pedestrian_crossing', 'roundabout')
+GENERATED_FEATURES = MOTORWAY_FEATURES + URBAN_FEATURES + ('junction',)
+
+# Bit position per RISK_FEATURES entry, and the weight of each feature by bit
+FEATURE_INDEX = {feature: i for i, feature in enumerate(RISK_FEATURES)}
+FEATURE_WEIGHTS = np.array([RISK_WEIGHTS.get(f, 0) for f in RISK_FEATURES])
+
+# Kernel rows of (feature bit, probability threshold to beat, weight sign);
+# the original rules subtract the (negative) motorway lane/shoulder weights
+_MOTORWAY_ROLLS = np.array([(FEATURE_INDEX[f], p, sign) for f, p, sign in
+                            zip(MOTORWAY_FEATURES, (0.7, 0.8, 0.95),
+                                (-1, -1, 1))])
+_URBAN_ROLLS = np.array([(FEATURE_INDEX[f], p, 1) for f, p in
+                         zip(URBAN_FEATURES, (0.6, 0.7, 0.85))])
+_JUNCTION_BIT = FEATURE_INDEX['junction']
+
+RISK_LEVEL_NAMES = ('COMPLIANT', 'MODERATE', 'CRITICAL')
+RISK_COLORS = ('green', 'yellow', 'red')
+
+
+@njit(parallel=True, cache=True)
+def _gen_segments(start_lat, start_lon, end_lat, end_lon, n, motorway,
+                  rolls, junction_bit, weights):
+    """Numeric core for ``n`` segments of one route, filled in parallel."""
+    lats = np.empty(n)
+    lons = np.empty(n)
+    scores = np.empty(n)
+    masks = np.zeros(n, dtype=np.uint32)
+    quality = np.empty((n, 3))
+    weather = np.empty(n)
+
+    for i in prange(n):
+        # Interpolate position along route
+        progress = i / n
+        lats[i] = start_lat + (end_lat - start_lat) * progress
+        lons[i] = start_lon + (end_lon - start_lon) * progress
+
+        # Base readiness score (60-95 for motorways, lower for urban)
+        if motorway:
+            base_score = np.random.uniform(70, 90)
+        else:
+            base_score = np.random.uniform(50, 75)
+
+        # Randomly assign features based on road type
+        mask = 0
+        risk_adjustments = 0.0
+        for r in range(rolls.shape[0]):
+            if np.random.random() > rolls[r, 1]:
+                bit = int(rolls[r, 0])
+                mask |= 1 << bit
+                risk_adjustments += rolls[r, 2] * weights[bit]
+
+        # Random challenging conditions
+        if np.random.random() > 0.92:
+            mask |= 1 << junction_bit
+            risk_adjustments += weights[junction_bit]
+        masks[i] = mask
+
+        # Calculate final score (clamped 0-100)
+        scores[i] = max(0.0, min(100.0, base_score - risk_adjustments * 20))
+
+        # Based on research: 0.5 = critical
+        quality[i, 0] = np.random.uniform(0.4, 0.95)
+        quality[i, 1] = np.random.uniform(0.6, 1.0)
+        quality[i, 2] = np.random.uniform(0.5, 0.9)
+        weather[i] = np.random.uniform(0, 0.3)
+
+    return lats, lons, scores, masks, quality, weather
+
+
+def generate_route_columns(route: Dict, num_segments: int) -> Dict[str, np.ndarray]:
+    """Generate one route's segment fields as column arrays."""
+    motorway = 'motorway' in route['road_types']
+    lats, lons, scores, masks, quality, weather = _gen_segments(
+        route['start']['lat'], route['start']['lon'],
+        route['end']['lat'], route['end']['lon'],
+        num_segments, motorway,
+        _MOTORWAY_ROLLS if motorway else _URBAN_ROLLS, _JUNCTION_BIT,
+        FEATURE_WEIGHTS)
 
     # Risk category based on research thresholds
-    if final_score >= 75:
-        risk_level = 'COMPLIANT'
-        risk_color = 'green'
-    elif final_score >= 50:
-        risk_level = 'MODERATE'
-        risk_color = 'yellow'
-    else:
-        risk_level = 'CRITICAL'
-        risk_color = 'red'
+    risk_levels = np.where(scores >= 75, 0, np.where(scores >= 50, 1, 2))
 
     return {
-        'segment_id': f"{route['name'].replace(' ', '_')}_{segment_idx}",
-        'latitude': round(lat, 6),
-        'longitude': round(lon, 6),
-        'readiness_score': round(final_score, 1),
-        'risk_level': risk_level,
-        'risk_color': risk_color,
-        'detected_features': detected_features,
-        'infrastructure_quality': {
-            # Based on research: 0.5 = critical
-            'lane_markings': round(random.uniform(0.4, 0.95), 2),
-            'signage_visibility': round(random.uniform(0.6, 1.0), 2),
-            'surface_condition': round(random.uniform(0.5, 0.9), 2)
-        },
-        # Future: real-time API
-        'weather_impact': round(random.uniform(0, 0.3), 2),
-        'timestamp': datetime.utcnow().isoformat()
+        'latitude': lats.round(6),
+        'longitude': lons.round(6),
+        'readiness_score': scores.round(1),
+        'risk_level': risk_levels.astype(np.int8),
+        'feature_mask': masks,
+        'infrastructure_quality': quality.round(2),
+        'weather_impact': weather.round(2),
+    }
+
+
+def route_segments(route: Dict, columns: Dict[str, np.ndarray]) -> List[Dict]:
+    """Assemble a route's column arrays into segment dicts."""
+    prefix = route['name'].replace(' ', '_')
+    timestamp = datetime.utcnow().isoformat()
+    # Few distinct feature combinations occur, so decode each mask once
+    features_by_mask = {
+        mask: [f for f in GENERATED_FEATURES if mask >> FEATURE_INDEX[f] & 1]
+        for mask in set(columns['feature_mask'].tolist())
     }
 
+    return [
+        {
+            'segment_id': f"{prefix}_{i}",
+            'latitude': lat,
+            'longitude': lon,
+            'readiness_score': score,
+            'risk_level': RISK_LEVEL_NAMES[level],
+            'risk_color': RISK_COLORS[level],
+            'detected_features': list(features_by_mask[mask]),
+            'infrastructure_quality': {
+                'lane_markings': lane,
+                'signage_visibility': signage,
+                'surface_condition': surface
+            },
+            # Future: real-time API
+            'weather_impact': weather,
+            'timestamp': timestamp,
+            'route_name': route['name']
+        }
+        for i, (lat, lon, score, level, mask, (lane, signage, surface), weather)
+        in enumerate(zip(
+            columns['latitude'].tolist(), columns['longitude'].tolist(),
+            columns['readiness_score'].tolist(),
+            columns['risk_level'].tolist(), columns['feature_mask'].tolist(),
+            columns['infrastructure_quality'].tolist(),
+            columns['weather_impact'].tolist()))
+    ]
+
 
 def generate_mock_dataset(segments_per_km: int = 20) -> List[Dict]:
     """Generate complete mock dataset for all major routes."""
@@ -149,15 +224,22 @@ def generate_mock_dataset(segments_per_km: int = 20) -> List[Dict]:
 
     for route in MAJOR_ROUTES:
         num_segments = int(route['distance_km'] * segments_per_km)
-
-        for i in range(num_segments):
-            segment = generate_segment_data(route, i, num_segments)
-            segment['route_name'] = route['name']
-            all_segments.append(segment)
+        columns = generate_route_columns(route, num_segments)
+        all_segments.extend(route_segments(route, columns))
 
     return all_segments
 
 
+def dump_json(dataset: List[Dict], path: str) -> None:
+    """Write the dataset as indented JSON, with orjson when installed."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(dataset, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(dataset, f, indent=2)
+
+
 if __name__ == "__main__":
     # Generate dataset
     dataset = generate_mock_dataset(segments_per_km=20)  # Every 50m
@@ -166,7 +248,6 @@ if __name__ == "__main__":
     print(f"Sample segment:\n{json.dumps(dataset[0], indent=2)}")
 
     # Save to JSON
-    with open('mock_cav_readiness_data.json', 'w') as f:
-        json.dump(dataset, f, indent=2)
+    dump_json(dataset, 'mock_cav_readiness_data.json')
 
     print("\nDataset saved to mock_cav_readiness_data.json")
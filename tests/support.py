@@ -0,0 +1,29 @@
+"""Import main against a small generated dataset, once per test run."""
+
+import importlib
+import os
+import sys
+import tempfile
+
+import mock_data_generator
+
+_DATA_DIR = None
+
+
+def import_main():
+    """The main module, loaded from a temporary dataset directory."""
+    global _DATA_DIR
+    if _DATA_DIR is None:
+        _DATA_DIR = tempfile.TemporaryDirectory()
+        mock_data_generator.dump_json(
+            mock_data_generator.generate_mock_dataset(segments_per_km=2),
+            os.path.join(_DATA_DIR.name, 'mock_cav_readiness_data.json'))
+        sys.modules.pop('main', None)
+
+    # main loads its data from the working directory at import
+    cwd = os.getcwd()
+    os.chdir(_DATA_DIR.name)
+    try:
+        return importlib.import_module('main')
+    finally:
+        os.chdir(cwd)
@@ -0,0 +1,32 @@
+"""Nearest-segment lookups from concurrent threads, as in FastAPI's threadpool."""
+
+import random
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.support import import_main
+
+
+class ConcurrentLookupTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.main = import_main()
+
+    def test_matches_serial_lookups(self):
+        main = self.main
+        rng = random.Random(0)
+        points = [(rng.uniform(50.0, 55.0), rng.uniform(-4.0, 1.5))
+                  for _ in range(4000)]
+
+        def lookup(point):
+            return main.find_nearest_segment_index(*point, max_distance_km=50)
+
+        expected = [lookup(p) for p in points]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for _ in range(5):
+                self.assertEqual(list(pool.map(lookup, points)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Query parameter validation on the location and route endpoints."""
+
+import unittest
+
+from fastapi.testclient import TestClient
+
+from tests.support import import_main
+
+BAD_LATS = ['1e308', 'nan', 'inf', '-inf', '90.5', '-91']
+BAD_LONS = ['1e308', 'nan', 'inf', '-inf', '180.5', '-181']
+
+
+class CoordinateBoundsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(import_main().app)
+
+    def test_location_rejects_out_of_range(self):
+        for lat in BAD_LATS:
+            r = self.client.get('/api/v1/location/readiness',
+                                params={'lat': lat, 'lon': 0})
+            self.assertEqual(r.status_code, 422, lat)
+        for lon in BAD_LONS:
+            r = self.client.get('/api/v1/location/readiness',
+                                params={'lat': 51.5, 'lon': lon})
+            self.assertEqual(r.status_code, 422, lon)
+
+    def test_route_rejects_out_of_range(self):
+        route = {'start_lat': 51.1279, 'start_lon': 1.3134,
+                 'end_lat': 52.0406, 'end_lon': -0.7594}
+        for name, values in (('start_lat', BAD_LATS), ('end_lat', BAD_LATS),
+                             ('start_lon', BAD_LONS), ('end_lon', BAD_LONS)):
+            for value in values:
+                r = self.client.get('/api/v1/route/assess',
+                                    params={**route, name: value})
+                self.assertEqual(r.status_code, 422, (name, value))
+
+    def test_accepts_bounds(self):
+        r = self.client.get('/api/v1/location/readiness',
+                            params={'lat': 90, 'lon': -180})
+        self.assertEqual(r.status_code, 404)
+        r = self.client.get('/api/v1/route/assess',
+                            params={'start_lat': -90, 'start_lon': 180,
+                                    'end_lat': 90, 'end_lon': -180})
+        self.assertEqual(r.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
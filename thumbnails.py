@@ -0,0 +1,29 @@
+# 🖼️ Popup thumbnail generation for the CAV inference map
+#
+# Kept in its own module so ProcessPoolExecutor workers can import
+# make_thumb by name (functions defined inside a Streamlit script cannot be
+# pickled on spawn-based platforms such as Windows).
+
+THUMB_SIZE = (300, 300)
+
+
+def make_thumb(path):
+    """Return a JPEG thumbnail of the image as a base64 data URI.
+
+    Falls back to the raw file URI when the image cannot be read.
+    """
+    # Imported here so the viewer only pays for PIL once thumbnails are built
+    from PIL import Image
+    import base64
+    import io
+
+    # Truncated or corrupt files only fail once decoded, so the fallback
+    # has to cover the thumbnail and save as well as the open
+    try:
+        with Image.open(path) as im:
+            im.thumbnail(THUMB_SIZE)
+            buf = io.BytesIO()
+            im.convert("RGB").save(buf, "JPEG", quality=75)
+    except OSError:
+        return f"file://{path}"
+    return "data:image/jpeg;base64," + base64.b64encode(buf.getvalue()).decode()